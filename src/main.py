@@ -2,15 +2,18 @@
 import os
 import re
 import time
-import json
 import logging
-import threading
+import asyncio
+import functools
+import urllib.parse
 from typing import Dict, Any, Optional
 
-import requests
-from bs4 import BeautifulSoup
-from cachetools import TTLCache
+import httpx
+import orjson
+import xxhash
+from cachetools import TLRUCache, TTLCache
 from mcp.server.fastmcp import FastMCP
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 # ─────────────────────────────────────────────────────────────
 # MCP 서버 인스턴스 생성
@@ -23,9 +26,15 @@ mcp = FastMCP("Naver Weather MCP (STDIO)")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 log = logging.getLogger("naver-weather")
 
-CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "600"))        # 10분
-RATE_LIMIT_INTERVAL = float(os.getenv("RATE_LIMIT_INTERVAL", "1.0"))  # 초당 1회
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "600"))            # 10분
+NEG_CACHE_TTL_SECONDS = int(os.getenv("NEG_CACHE_TTL_SECONDS", "60"))      # 실패 캐시 1분
+HTTP_CACHE_TTL_SECONDS = int(os.getenv("HTTP_CACHE_TTL_SECONDS", "1800"))  # 조건부 GET/stale 응답용 30분
+RATE_LIMIT_INTERVAL = float(os.getenv("RATE_LIMIT_INTERVAL", "1.0"))      # 초당 1회
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "5"))                # 유휴 후 허용 버스트
+PREWARM_REGIONS = tuple(r.strip() for r in os.getenv("PREWARM_REGIONS", "").split(",") if r.strip())
+REDIS_URL = os.getenv("REDIS_URL")                                         # 설정 시 워커 간 공유 캐시(L2)
 DEFAULT_TIMEOUT = 6.0
+REDIS_TIMEOUT = 0.5  # Redis 장애 시 L1 미스마다 오래 기다리지 않도록
 
 SEARCH_URL = "https://search.naver.com/search.naver?query={query}"
 USER_AGENT = (
@@ -34,10 +43,115 @@ USER_AGENT = (
     "Chrome/124.0.0.0 Safari/537.36"
 )
 
+# ─────────────────────────────────────────────────────────────
+# 날씨 캐시 (L1: 프로세스 로컬 TTLCache, L2: Redis, REDIS_URL 설정 시)
+# ─────────────────────────────────────────────────────────────
+class WeatherCache:
+    def __init__(self, ttl: int, redis_url: Optional[str] = None, maxsize: int = 256):
+        self.ttl = ttl
+        self.redis_url = redis_url
+        # 키 → (만료 시각, 데이터). 항목마다 만료 시각을 따로 둬서 Redis에서 채운 항목은
+        # 수집 시각 기준 TTL을, stale 응답은 짧은 TTL을 적용
+        self.local: TLRUCache[str, tuple[float, Dict[str, Any]]] = TLRUCache(
+            maxsize=maxsize, ttu=lambda _key, entry, _now: entry[0], timer=time.time
+        )
+        self._redis = None
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"weather:{key}"
+
+    def _redis_client(self):
+        if self.redis_url and self._redis is None:
+            import redis.asyncio as redis_asyncio
+            self._redis = redis_asyncio.Redis.from_url(
+                self.redis_url, socket_connect_timeout=REDIS_TIMEOUT, socket_timeout=REDIS_TIMEOUT
+            )
+        return self._redis
+
+    def get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.local.get(key)
+        return entry[1] if entry else None
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self.get_local(key)
+        if data is not None:
+            return data
+        return await self._get_shared(key)
+
+    async def get_fresh(self, key: str, max_age: float) -> Optional[Dict[str, Any]]:
+        # max_age초 이내에 수집된 항목만 반환 (L1이 오래됐으면 L2도 확인)
+        now = time.time()
+        data = self.get_local(key)
+        if data is None or now - data["timestamp"] >= max_age:
+            data = await self._get_shared(key)
+        if data is None or now - data["timestamp"] >= max_age:
+            return None
+        return data
+
+    async def _get_shared(self, key: str) -> Optional[Dict[str, Any]]:
+        redis = self._redis_client()
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(self._redis_key(key))
+            if raw is None:
+                return None
+            data = orjson.loads(raw)
+            if not isinstance(data, dict) or not isinstance(data.get("timestamp"), int):
+                log.warning(f"[cache] ignoring malformed redis value for key='{key}'")
+                return None
+            self.local[key] = (data["timestamp"] + self.ttl, data)
+        except Exception as e:
+            log.warning(f"[cache] redis get failed: {e}")
+            return None
+        return data
+
+    async def set(self, key: str, data: Dict[str, Any], ttl: Optional[int] = None, shared: bool = True) -> None:
+        # shared=False: 이 워커의 L1에만 저장 (stale 데이터를 다른 워커와 공유하지 않음)
+        self.local[key] = (time.time() + (ttl or self.ttl), data)
+        redis = self._redis_client()
+        if redis is None or not shared:
+            return
+        try:
+            await redis.setex(self._redis_key(key), self.ttl, orjson.dumps(data))
+        except Exception as e:
+            log.warning(f"[cache] redis set failed: {e}")
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            redis, self._redis = self._redis, None
+            await redis.aclose()
+
 # 캐시/레이트리밋
-cache: TTLCache[str, Dict[str, Any]] = TTLCache(maxsize=256, ttl=CACHE_TTL_SECONDS)
-_last_request_ts = 0.0
-_rl_lock = threading.Lock()
+cache = WeatherCache(ttl=CACHE_TTL_SECONDS, redis_url=REDIS_URL)
+_rendered: TTLCache[tuple[str, str, int], str] = TTLCache(maxsize=512, ttl=CACHE_TTL_SECONDS)  # (지역, 포맷, 수집시각) → 출력 문자열
+_neg_cache: TTLCache[str, str] = TTLCache(maxsize=256, ttl=NEG_CACHE_TTL_SECONDS)         # 지역 → 실패 사유
+# URL → (ETag, Last-Modified, 마지막 정상 HTML(파싱 성공 후에는 파싱 대상 조각), 수집/재검증 시각)
+_http_cache: TTLCache[str, tuple[Optional[str], Optional[str], str, int]] = TTLCache(maxsize=256, ttl=HTTP_CACHE_TTL_SECONDS)
+_parsed_by_hash: TTLCache[bytes, Dict[str, Any]] = TTLCache(maxsize=256, ttl=HTTP_CACHE_TTL_SECONDS)  # 조각 해시 → 파싱 결과
+_inflight: Dict[str, asyncio.Task] = {}  # 지역 → 진행 중인 조회 (singleflight)
+_inflight_lock = asyncio.Lock()
+_rl_tokens = float(RATE_LIMIT_BURST)
+_rl_last_refill = time.monotonic()
+_rl_lock = asyncio.Lock()
+
+# HTTP 클라이언트 (HTTP/2 + keep-alive 커넥션 재사용)
+# 프로세스 수명 동안 유지하고 종료 시 _shutdown()에서 닫음
+_client = httpx.AsyncClient(
+    http2=True,
+    timeout=DEFAULT_TIMEOUT,
+    follow_redirects=True,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    headers={
+        "User-Agent": USER_AGENT,
+        "Accept-Language": "ko-KR,ko;q=0.9",
+        "Accept-Encoding": "gzip, br",
+    },
+)
+
+# 배치 조회 최대 지역 수
+MAX_BATCH_REGIONS = 20
 
 # 재시도
 MAX_RETRIES = 3
@@ -52,69 +166,147 @@ SELECTORS = {
     "humidity_guess_blocks": [".summary_list", ".weather_info", ".temperature_info"],
 }
 
+# 파싱 핫패스용 사전 컴파일 정규식/셀렉터
+_HUMIDITY_RE = re.compile(r"습도\s*([0-9]{1,3})\s*%?")
+_LEADING_NONNUM_RE = re.compile(r"^[^\d\-\+]*")
+_TEMP_PRIMARY = tuple(SELECTORS["temp_primary"])
+_TEMP_FALLBACK = tuple(SELECTORS["temp_fallback"])
+_STATUS_PRIMARY = tuple(SELECTORS["status_primary"])
+_STATUS_FALLBACK = tuple(SELECTORS["status_fallback"])
+_SENSIBLE_TEMP = tuple(SELECTORS["sensible_temp"])
+_HUMIDITY_BLOCKS = tuple(SELECTORS["humidity_guess_blocks"])
+
+# 날씨 모듈 주변만 잘라서 파싱 (<body> 이후 센티널 기준 앞뒤 윈도우)
+# class 속성 안의 완전한 클래스명만 인정 (weather_info_* 이름이나 스크립트 속 문자열은 제외)
+_WEATHER_SENTINEL_RES = tuple(
+    re.compile(rf'class="[^"]*\b{name}\b[^"]*"') for name in ("weather_info", "temperature_text")
+)
+_WEATHER_ROOT = ".weather_info"
+_PARSE_WINDOW = 20_000
+
 # ─────────────────────────────────────────────────────────────
 # 유틸 함수
 # ─────────────────────────────────────────────────────────────
-def _rate_limit():
-    global _last_request_ts
-    with _rl_lock:
+async def _rate_limit():
+    # 토큰 버킷: 유휴 시간 동안 토큰을 적립하고, 토큰이 있으면 대기 없이 통과
+    global _rl_tokens, _rl_last_refill
+    rate = 1.0 / RATE_LIMIT_INTERVAL
+    async with _rl_lock:
         now = time.monotonic()
-        wait = (_last_request_ts + RATE_LIMIT_INTERVAL) - now
-        if wait > 0:
-            time.sleep(wait)
-        _last_request_ts = time.monotonic()
+        _rl_tokens = min(float(RATE_LIMIT_BURST), _rl_tokens + (now - _rl_last_refill) * rate)
+        _rl_last_refill = now
+        if _rl_tokens < 1:
+            await asyncio.sleep((1 - _rl_tokens) / rate)
+            _rl_tokens = 1.0
+            _rl_last_refill = time.monotonic()
+        _rl_tokens -= 1
 
-def _fetch_html(url: str) -> str:
-    headers = {"User-Agent": USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9"}
+async def _fetch_html(url: str) -> tuple[str, Optional[int]]:
+    # (HTML, stale_since): 재시도가 모두 실패해 이전 HTML을 돌려줄 때만 stale_since에 그 수집 시각을 담음
+    cached = _http_cache.get(url)
+    headers = {}
+    if cached:
+        etag, last_modified, _, _ = cached
+        if etag: headers["If-None-Match"] = etag
+        if last_modified: headers["If-Modified-Since"] = last_modified
     err: Optional[Exception] = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            _rate_limit()
-            resp = requests.get(url, headers=headers, timeout=DEFAULT_TIMEOUT)
+            await _rate_limit()
+            resp = await _client.get(url, headers=headers)
+            if resp.status_code == 304 and cached:
+                log.info(f"[fetch] not modified: {url}")
+                # 재검증 성공 시 TTL 갱신 (새 검증자가 오면 교체)
+                _http_cache[url] = (
+                    resp.headers.get("ETag") or cached[0],
+                    resp.headers.get("Last-Modified") or cached[1],
+                    cached[2],
+                    int(time.time()),
+                )
+                return cached[2], None
             if resp.status_code >= 500 or resp.status_code == 429:
-                raise requests.HTTPError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+                raise httpx.HTTPStatusError(
+                    f"HTTP {resp.status_code}: {resp.text[:200]}", request=resp.request, response=resp
+                )
             resp.raise_for_status()
-            return resp.text
+            # 파싱이 성공하면 _fetch_and_cache에서 파서가 쓰는 조각만 남기도록 줄임
+            html = resp.text
+            _http_cache[url] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"), html, int(time.time()))
+            return html, None
         except Exception as e:
             err = e
             sleep_for = BACKOFF_BASE * (2 ** (attempt - 1))
             log.warning(f"[fetch] attempt {attempt}/{MAX_RETRIES} failed: {e}. backoff {sleep_for:.1f}s")
-            time.sleep(sleep_for)
+            await asyncio.sleep(sleep_for)
+    if cached:
+        log.warning(f"[fetch] serving stale html after retries failed: {err}")
+        return cached[2], cached[3]
     raise RuntimeError(f"Failed to fetch after retries: {err}")
 
-def _first_text(soup: BeautifulSoup, selectors: list[str]) -> Optional[str]:
+def _first_text(scope: LexborNode, selectors: tuple[str, ...]) -> Optional[str]:
     for sel in selectors:
-        el = soup.select_one(sel)
-        if el:
-            txt = el.get_text(strip=True)
+        node = scope.css_first(sel)
+        if node:
+            txt = node.text(deep=True, strip=True)
             if txt:
                 return txt
     return None
 
-def _guess_humidity(soup: BeautifulSoup) -> Optional[str]:
-    for block_sel in SELECTORS["humidity_guess_blocks"]:
-        block = soup.select_one(block_sel)
+def _guess_humidity(scope: LexborNode) -> Optional[str]:
+    for block_sel in _HUMIDITY_BLOCKS:
+        block = scope.css_first(block_sel)
         if not block:
             continue
-        text = block.get_text(" ", strip=True)
-        m = re.search(r"습도\s*([0-9]{1,3})\s*%?", text)
+        text = block.text(separator=" ", strip=True)
+        m = _HUMIDITY_RE.search(text)
         if m:
             return m.group(1) + "%"
     return None
 
 def _normalize_temp(txt: str) -> str:
-    clean = re.sub(r"^[^\d\-\+]*", "", txt)
+    clean = _LEADING_NONNUM_RE.sub("", txt)
     t = clean.replace("도", "").replace(" ", "").replace("°", "")
     if t.startswith("+"):
         t = t[1:]
     return f"{t}°C" if t else txt
 
-def _parse_weather(html: str, region: str) -> Dict[str, Any]:
-    soup = BeautifulSoup(html, "html.parser")
-    temp = _first_text(soup, SELECTORS["temp_primary"]) or _first_text(soup, SELECTORS["temp_fallback"])
-    status = _first_text(soup, SELECTORS["status_primary"]) or _first_text(soup, SELECTORS["status_fallback"])
-    sensible = _first_text(soup, SELECTORS["sensible_temp"])
-    humidity = _guess_humidity(soup)
+@functools.lru_cache(maxsize=1024)
+def _source_url(region: str) -> str:
+    return SEARCH_URL.format(query=urllib.parse.quote_plus(f"{region} 날씨"))
+
+def _weather_fragment(html: str) -> str:
+    # <head>의 인라인 script/style은 건너뛰고 <body>부터 탐색
+    body = html.find("<body")
+    start = body if body != -1 else 0
+    for sentinel_re in _WEATHER_SENTINEL_RES:
+        m = sentinel_re.search(html, start)
+        if m:
+            idx = m.start()
+            return html[max(start, idx - _PARSE_WINDOW):idx + _PARSE_WINDOW]
+    return html[start:]
+
+def _extract_fields(html: str) -> tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    tree = LexborHTMLParser(html)
+    # 날씨 모듈 서브트리 안에서만 셀렉터 탐색, 못 찾으면 문서 전체로
+    root = tree.root
+    scope = tree.css_first(_WEATHER_ROOT) or root
+    temp = _first_text(scope, _TEMP_PRIMARY) or _first_text(scope, _TEMP_FALLBACK)
+    status = _first_text(scope, _STATUS_PRIMARY) or _first_text(scope, _STATUS_FALLBACK)
+    if scope is not root and not (temp or status):
+        scope = root
+        temp = _first_text(scope, _TEMP_PRIMARY) or _first_text(scope, _TEMP_FALLBACK)
+        status = _first_text(scope, _STATUS_PRIMARY) or _first_text(scope, _STATUS_FALLBACK)
+    sensible = _first_text(scope, _SENSIBLE_TEMP)
+    humidity = _guess_humidity(scope)
+    return temp, status, sensible, humidity
+
+def _parse_weather(html: str, region: str, url: str, body: Optional[str] = None) -> Dict[str, Any]:
+    # html은 _weather_fragment로 잘라낸 조각, body는 그 원본
+    temp, status, sensible, humidity = _extract_fields(html)
+    if not (temp or status) and body is not None and len(html) < len(body):
+        # 윈도우가 날씨 모듈을 놓친 경우 전체 본문으로 다시 파싱
+        log.info(f"[parse] fragment had no weather fields for region='{region}', reparsing full body")
+        temp, status, sensible, humidity = _extract_fields(body)
     if temp:
         temp = _normalize_temp(temp)
     return {
@@ -123,57 +315,206 @@ def _parse_weather(html: str, region: str) -> Dict[str, Any]:
         "temperature": temp,
         "sensible_temperature": sensible,
         "humidity": humidity,
-        "source": SEARCH_URL.format(query=f"{region}+날씨"),
+        "source": url,
         "timestamp": int(time.time()),
     }
 
+def _format_error(reason: str) -> str:
+    return f"[오류] 날씨 정보를 가져오는 중 문제가 발생했습니다. 잠시 후 다시 시도해 주세요. (reason: {reason})"
+
 def _format_text(data: Dict[str, Any]) -> str:
-    lines = [f"[네이버 날씨] {data.get('region','-')}"]
-    if data.get("status"): lines.append(f"- 상태: {data['status']}")
-    if data.get("temperature"): lines.append(f"- 기온: {data['temperature']}")
-    if data.get("sensible_temperature"): lines.append(f"- 체감온도: {data['sensible_temperature']}")
-    if data.get("humidity"): lines.append(f"- 습도: {data['humidity']}")
-    if data.get("source"): lines.append(f"- 참고: {data['source']}")
+    status = data.get("status")
+    temp = data.get("temperature")
+    sensible = data.get("sensible_temperature")
+    humidity = data.get("humidity")
+    source = data.get("source")
+    source_line = f"- 참고: {source}" if source else None
+    lines = list(filter(None, (
+        f"[네이버 날씨] {data.get('region') or '-'}",
+        f"- 상태: {status}" if status else None,
+        f"- 기온: {temp}" if temp else None,
+        f"- 체감온도: {sensible}" if sensible else None,
+        f"- 습도: {humidity}" if humidity else None,
+        source_line,
+    )))
     if len(lines) <= 2:
         lines.append("- 안내: 일부 정보 수집에 실패했습니다. 잠시 후 다시 시도해 주세요.")
-        if data.get("source"): lines.append(f"- 참고: {data['source']}")
+        if source_line: lines.append(source_line)
     return "\n".join(lines)
 
+async def _fetch_and_cache(region_key: str) -> Dict[str, Any]:
+    url = _source_url(region_key)
+    body, stale_since = await _fetch_html(url)
+    timestamp = stale_since or int(time.time())
+    # 파서가 실제로 읽는 조각 기준으로 해시 (페이지 다른 곳의 요청별 토큰에 영향받지 않음)
+    fragment = _weather_fragment(body)
+    digest = xxhash.xxh3_64(fragment.encode()).digest()
+    parsed = _parsed_by_hash.get(digest)
+    if parsed is not None:
+        # 조각이 이전과 동일하면 재파싱 없이 메타 필드만 갱신
+        log.info(f"[parse] unchanged weather fragment for region='{region_key}', reusing parsed result")
+        data = {**parsed, "region": region_key, "source": url, "timestamp": timestamp}
+    else:
+        data = await asyncio.to_thread(_parse_weather, fragment, region_key, url, body)
+        data["timestamp"] = timestamp
+        if data["temperature"] or data["status"]:
+            # 파싱에 실패한 본문은 재사용하지 않고, 성공한 본문은 조각만 남김
+            _parsed_by_hash[digest] = data
+            entry = _http_cache.get(url)
+            if entry and entry[2] is body:
+                _http_cache[url] = (entry[0], entry[1], fragment, entry[3])
+    if stale_since is not None:
+        # 오래된 HTML로 만든 결과: 원래 수집 시각 유지, 짧게만 로컬 캐시하고 L2에는 쓰지 않음
+        await cache.set(region_key, data, ttl=NEG_CACHE_TTL_SECONDS, shared=False)
+    else:
+        await cache.set(region_key, data)
+    return data
+
+async def _singleflight_fetch(region_key: str) -> Dict[str, Any]:
+    try:
+        return await _fetch_and_cache(region_key)
+    except Exception as e:
+        log.exception("weather fetch/parse failed")
+        if not _client.is_closed:  # 종료 중 실패는 지역 문제가 아니므로 캐시하지 않음
+            _neg_cache[region_key] = str(e)[:120]
+        raise
+    finally:
+        _inflight.pop(region_key, None)
+
+def _consume_result(task: asyncio.Task) -> None:
+    # 기다리는 호출자가 모두 취소된 경우 'never retrieved' 경고 방지
+    if not task.cancelled():
+        task.exception()
+
+async def _load_weather(region_key: str, refresh: bool = False) -> Dict[str, Any]:
+    # 같은 지역의 동시 캐시 미스는 한 번만 조회하고 결과를 공유.
+    # 조회는 별도 태스크로 돌리고 shield로 기다리므로, 한 호출자가 취소돼도 다른 대기자에게 전파되지 않음
+    async with _inflight_lock:
+        task = _inflight.get(region_key)
+        if task is None:
+            data = None if refresh else cache.get_local(region_key)
+            if data is not None:
+                return data
+            task = asyncio.create_task(_singleflight_fetch(region_key))
+            task.add_done_callback(_consume_result)
+            _inflight[region_key] = task
+        else:
+            log.info(f"[singleflight] joining in-flight fetch for region='{region_key}'")
+    return await asyncio.shield(task)
+
+async def _get_one(region_key: str) -> Dict[str, Any]:
+    if region_key in _neg_cache:
+        log.info(f"[cache] negative hit for region='{region_key}'")
+        raise RuntimeError(_neg_cache[region_key])
+    data = await cache.get(region_key)
+    if data is not None:
+        log.info(f"[cache] hit for region='{region_key}'")
+        return data
+    return await _load_weather(region_key)
+
+def _render(region_key: str, data: Dict[str, Any], fmt: str) -> str:
+    render_key = (region_key, fmt, data["timestamp"])
+    out = _rendered.get(render_key)
+    if out is None:
+        if fmt == "json":
+            out = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        else:
+            out = _format_text(data)
+        _rendered[render_key] = out
+    return out
+
+# ─────────────────────────────────────────────────────────────
+# 인기 지역 캐시 예열 (PREWARM_REGIONS)
+# ─────────────────────────────────────────────────────────────
+async def _prewarm_one(region_key: str, max_age: float) -> bool:
+    # 다른 워커가 이미 이번 주기에 갱신했다면(L1/L2에 신선한 항목) 건너뜀
+    if await cache.get_fresh(region_key, max_age) is not None:
+        return False
+    await _load_weather(region_key, refresh=True)
+    return True
+
+async def _prewarm_loop(regions: tuple[str, ...]) -> None:
+    # TTL 만료 30초 전에 다시 채워서 인기 지역은 캐시 미스가 나지 않도록 유지
+    interval = max(CACHE_TTL_SECONDS - 30, 30)
+    while True:
+        results = await asyncio.gather(*(_prewarm_one(r, interval) for r in regions), return_exceptions=True)
+        refreshed = sum(1 for r in results if r is True)
+        failed = sum(1 for r in results if isinstance(r, BaseException))
+        log.info(
+            f"[prewarm] refreshed {refreshed}, fresh {len(regions) - refreshed - failed}, "
+            f"failed {failed} of {len(regions)} regions, next in {interval}s"
+        )
+        await asyncio.sleep(interval)
+
 # ─────────────────────────────────────────────────────────────
 # MCP 툴 및 리소스 등록
 # ─────────────────────────────────────────────────────────────
 @mcp.tool(name="get_weather_by_region", description="지역명을 받아 네이버 검색 결과(날씨 모듈)에서 현재 상태/기온 등을 조회합니다. format='text'|'json'")
-def get_weather_by_region(region: str, format: str = "text") -> str:
+async def get_weather_by_region(region: str, format: str = "text") -> str:
     region_key = (region or "").strip()
     if not region_key:
         return "지역명이 비어 있습니다. 예: region='서울'"
 
-    if region_key in cache:
-        data = cache[region_key]
-        log.info(f"[cache] hit for region='{region_key}'")
-    else:
-        try:
-            html = _fetch_html(SEARCH_URL.format(query=f"{region_key}+날씨"))
-            data = _parse_weather(html, region_key)
-            cache[region_key] = data
-        except Exception as e:
-            log.exception("weather fetch/parse failed")
-            return f"[오류] 날씨 정보를 가져오는 중 문제가 발생했습니다. 잠시 후 다시 시도해 주세요. (reason: {str(e)[:120]})"
+    try:
+        data = await _get_one(region_key)
+    except Exception as e:
+        return _format_error(str(e)[:120])
+    return _render(region_key, data, "json" if (format or "").lower() == "json" else "text")
+
+@mcp.tool(name="get_weather_by_regions", description="여러 지역명을 받아 동시에 날씨를 조회합니다. format='text'(지역별 블록)|'json'(배열)")
+async def get_weather_by_regions(regions: list[str], format: str = "text") -> str:
+    region_keys = [k for k in ((r or "").strip() for r in regions or []) if k]
+    if not region_keys:
+        return "지역명 목록이 비어 있습니다. 예: regions=['서울', '부산']"
+    if len(region_keys) > MAX_BATCH_REGIONS:
+        return f"한 번에 최대 {MAX_BATCH_REGIONS}개 지역까지 조회할 수 있습니다. (요청: {len(region_keys)}개)"
 
+    results = await asyncio.gather(*(_get_one(k) for k in region_keys), return_exceptions=True)
     if (format or "").lower() == "json":
-        return json.dumps(data, ensure_ascii=False, indent=2)
-    return _format_text(data)
+        items = [
+            {"region": k, "error": str(r)[:120]} if isinstance(r, BaseException) else r
+            for k, r in zip(region_keys, results)
+        ]
+        return orjson.dumps(items, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    blocks = [
+        f"[네이버 날씨] {k}\n{_format_error(str(r)[:120])}" if isinstance(r, BaseException) else _render(k, r, "text")
+        for k, r in zip(region_keys, results)
+    ]
+    return "\n\n".join(blocks)
 
 @mcp.resource(uri="naver://weather/fields", name="supported_fields", description="이 MCP가 반환 가능한 필드 목록을 제공합니다.")
 def supported_fields() -> Dict[str, Any]:
     return {
         "fields": ["region", "status", "temperature", "sensible_temperature", "humidity", "source", "timestamp"],
         "cache_ttl_seconds": CACHE_TTL_SECONDS,
+        "negative_cache_ttl_seconds": NEG_CACHE_TTL_SECONDS,
         "rate_limit_seconds": RATE_LIMIT_INTERVAL,
+        "rate_limit_burst": RATE_LIMIT_BURST,
+        "prewarm_regions": list(PREWARM_REGIONS),
     }
 
 # ─────────────────────────────────────────────────────────────
 # STDIO 서버 실행
 # ─────────────────────────────────────────────────────────────
+async def _shutdown() -> None:
+    # 진행 중인 조회를 정리한 뒤 공유 클라이언트(HTTP, Redis)를 닫음
+    tasks = list(_inflight.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await _client.aclose()
+    await cache.close()
+
+async def _serve() -> None:
+    # 예열 루프는 MCP 세션과 무관하게 프로세스당 하나만 실행
+    prewarm = asyncio.create_task(_prewarm_loop(PREWARM_REGIONS)) if PREWARM_REGIONS else None
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        if prewarm is not None:
+            prewarm.cancel()
+            await asyncio.gather(prewarm, return_exceptions=True)
+        await _shutdown()
+
 if __name__ == "__main__":
-    mcp.run()
+    asyncio.run(_serve())